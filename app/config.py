@@ -1,3 +1,6 @@
+from functools import partial
+from typing import Callable
+
 import bugsnag
 from aiohttp.client_exceptions import ClientPayloadError
 from PIL import UnidentifiedImageError
@@ -8,6 +11,15 @@ from sanic_openapi import swagger_blueprint
 
 from . import settings, utils, views
 
+JSON_DUMPS: Callable[..., str] | None
+
+try:
+    from ujson import dumps  # type: ignore[import]
+except ImportError:  # Sanic falls back to the standard library's encoder
+    JSON_DUMPS = None
+else:
+    JSON_DUMPS = partial(dumps, escape_forward_slashes=False)
+
 IGNORED_EXCEPTIONS = (
     ClientPayloadError,
     MethodNotSupported,
@@ -55,6 +67,12 @@ def init(app):
     app.blueprint(views.templates.blueprint)
     app.blueprint(views.shortcuts.blueprint)  # registered last to avoid collisions
 
+    app.register_listener(start_tracking, "after_server_start")
+    app.register_listener(stop_tracking, "before_server_stop")
+    if settings.RENDER_PROCESSES:
+        app.register_listener(start_render_pool, "after_server_start")
+        app.register_listener(stop_render_pool, "before_server_stop")
+
     CORS(app)
     app.error_handler = BugsnagErrorHandler()
     bugsnag.configure(
@@ -62,3 +80,19 @@ def init(app):
         project_root="/app",
         release_stage=settings.RELEASE_STAGE,
     )
+
+
+async def start_tracking(app, loop):
+    await utils.meta.start_tracking()
+
+
+async def stop_tracking(app, loop):
+    await utils.meta.stop_tracking()
+
+
+async def start_render_pool(app, loop):
+    utils.images.start_render_pool()
+
+
+async def stop_render_pool(app, loop):
+    await utils.images.stop_render_pool()
@@ -1,4 +1,7 @@
-from sanic import Request
+from threading import Lock
+from typing import Any, Callable
+
+from sanic import Request, response
 
 from . import settings, utils
 from .models import Template
@@ -19,8 +22,59 @@ def get_valid_templates(
     return [template.jsonify(request) for template in templates]
 
 
+_CACHE: dict[tuple, Any] = {}
+_CACHE_LOCK = Lock()
+_CACHE_MTIME = 0.0
+
+
+def _cached(function: Callable, request: Request, *args):
+    global _CACHE_MTIME
+
+    if not settings.DEPLOYED:
+        return function(request, *args)
+
+    key = function, *args
+    mtime = _get_templates_mtime()
+    with _CACHE_LOCK:
+        if mtime != _CACHE_MTIME:
+            _CACHE.clear()
+            _CACHE_MTIME = mtime
+        elif key in _CACHE:
+            return _CACHE[key]
+
+    value = function(request, *args)
+    with _CACHE_LOCK:
+        if len(_CACHE) >= settings.EXAMPLE_CACHE_SIZE:
+            _CACHE.pop(next(iter(_CACHE)))
+        _CACHE[key] = value
+    return value
+
+
+def _get_templates_mtime() -> float:
+    paths = settings.TEMPLATES_DIRECTORY.glob("[!_]*/config.yml")
+    return max((path.stat().st_mtime for path in paths), default=0.0)
+
+
 def get_example_images(
     request: Request, query: str = "", animated: bool | None = None
+) -> list[tuple[str, str]]:
+    return _cached(_get_example_images, request, query, animated)
+
+
+def get_example_images_json(request: Request, query: str = "") -> bytes:
+    return _cached(_get_example_images_json, request, query)
+
+
+def _get_example_images_json(request: Request, query: str) -> bytes:
+    examples = get_example_images(request, query)
+    data = [{"url": url, "template": template} for url, template in examples]
+    body = response.json(data).body
+    assert body is not None, "JSON responses always have a body"
+    return body
+
+
+def _get_example_images(
+    request: Request, query: str, animated: bool | None
 ) -> list[tuple[str, str]]:
     templates = Template.objects.filter(valid=True, _exclude="_custom")
     if query:
@@ -7,7 +7,7 @@ from sanic_openapi import doc
 
 from app import config, helpers, settings, utils
 
-app = Sanic(name="memegen")
+app = Sanic(name="memegen", dumps=config.JSON_DUMPS)
 config.init(app)
 
 
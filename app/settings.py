@@ -7,6 +7,7 @@ ROOT = Path(__file__).parent.parent.resolve()
 
 PORT = int(os.environ.get("PORT", 5000))
 WORKERS = int(os.environ.get("WEB_CONCURRENCY", 1))
+RENDER_PROCESSES = int(os.environ.get("RENDER_PROCESSES", 0))
 DEBUG = bool(os.environ.get("DEBUG", False))
 
 if "DOMAIN" in os.environ:  # staging / production
@@ -30,6 +31,9 @@ DEPLOYED = RELEASE_STAGE != "local" and not DEBUG
 SUFFIX = " [DEBUG ONLY]" if not DEPLOYED else ""
 PLACEHOLDER = "string"  # Swagger UI placeholder value
 
+EXAMPLE_CACHE_SIZE = 256
+TEMPLATE_CACHE_SIZE = 4096
+
 # Fonts
 
 DEFAULT_FONT = "thick"
@@ -45,10 +49,11 @@ MINIMUM_FONT_SIZE = 7
 # Image rendering
 
 IMAGES_DIRECTORY = ROOT / "images"
+TEMPLATES_DIRECTORY = ROOT / "templates"
 
 DEFAULT_STYLE = "default"
 DEFAULT_EXTENSION = "png"
-ALLOWED_EXTENSIONS = [DEFAULT_EXTENSION, "jpg", "jpeg", "gif", "webp"]
+ALLOWED_EXTENSIONS = frozenset([DEFAULT_EXTENSION, "jpg", "jpeg", "gif", "webp"])
 PLACEHOLDER_SUFFIX = ".img"
 
 PREVIEW_SIZE = (300, 300)
@@ -57,6 +62,8 @@ DEFAULT_SIZE = (600, 600)
 MAXIMUM_PIXELS = 1920 * 1080
 MAXIMUM_FRAMES = 20
 
+MAXIMUM_INLINE_BYTES = 1024 * 1024
+
 # Watermarks
 
 DISABLED_WATERMARK = "none"
@@ -139,4 +146,8 @@ REMOTE_TRACKING_URL = os.getenv("REMOTE_TRACKING_URL")
 REMOTE_TRACKING_ERRORS = 0
 REMOTE_TRACKING_ERRORS_LIMIT = int(os.getenv("REMOTE_TRACKING_ERRORS_LIMIT", "10"))
 
+TRACKING_QUEUE_SIZE = 1024
+TRACKING_BATCH_SIZE = 64
+TRACKING_BATCH_DELAY = 0.05
+
 BUGSNAG_API_KEY = os.getenv("BUGSNAG_API_KEY")
@@ -0,0 +1,55 @@
+import os
+from unittest.mock import Mock
+
+import pytest
+from sanic import Request
+
+from .. import helpers, settings
+
+
+def describe_get_example_images():
+    @pytest.fixture
+    def templates_directory(monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "DEPLOYED", True)
+        monkeypatch.setattr(settings, "TEMPLATES_DIRECTORY", tmp_path)
+        monkeypatch.setattr(helpers, "_CACHE", {})
+        monkeypatch.setattr(helpers, "_CACHE_MTIME", 0.0)
+        (tmp_path / "fry").mkdir()
+        (tmp_path / "fry" / "config.yml").write_text("name: Fry\n")
+        return tmp_path
+
+    @pytest.fixture
+    def mock_request():
+        return Mock(spec=Request)
+
+    @pytest.fixture
+    def generate(monkeypatch):
+        function = Mock(side_effect=[["first"], ["second"]])
+        monkeypatch.setattr(helpers, "_get_example_images", function)
+        return function
+
+    def it_caches_results_per_query(
+        expect, templates_directory, mock_request, generate
+    ):
+        expect(helpers.get_example_images(mock_request, "fry")) == ["first"]
+        expect(helpers.get_example_images(mock_request, "fry")) == ["first"]
+        expect(generate.call_count) == 1
+
+    def it_ignores_new_custom_templates(
+        expect, templates_directory, mock_request, generate
+    ):
+        helpers.get_example_images(mock_request, "fry")
+        (templates_directory / "_custom-abc").mkdir()
+        (templates_directory / "_custom-abc" / "config.yml").write_text("")
+
+        expect(helpers.get_example_images(mock_request, "fry")) == ["first"]
+
+    def it_is_cleared_when_templates_change(
+        expect, templates_directory, mock_request, generate
+    ):
+        helpers.get_example_images(mock_request, "fry")
+        config = templates_directory / "fry" / "config.yml"
+        mtime = config.stat().st_mtime + 10
+        os.utime(config, (mtime, mtime))
+
+        expect(helpers.get_example_images(mock_request, "fry")) == ["second"]
@@ -237,6 +237,16 @@ def test_deployed_images(images, monkeypatch):
     utils.images.save(template, lines, directory=images)
 
 
+def test_saved_images_replace_temporary_files(template, tmp_path):
+    reference = tmp_path / "reference.png"
+    reference.touch()
+
+    path = utils.images.save(template, ["foo", "bar"], directory=tmp_path / "images")
+
+    assert list(path.parent.iterdir()) == [path]
+    assert path.stat().st_mode == reference.stat().st_mode
+
+
 def test_preview_images(images, template):
     path = images / "preview.jpg"
     data, _extension = utils.images.preview(template, ["nominal image", "while typing"])
@@ -1,3 +1,6 @@
+import asyncio
+from unittest.mock import AsyncMock
+
 import pytest
 
 from .. import settings, utils
@@ -31,3 +34,72 @@ def describe_track():
         await utils.meta.track(request, ["bar"])
 
         expect(settings.TRACK_REQUESTS) == False
+
+
+def describe_track_later():
+    @pytest.fixture
+    def track_many(monkeypatch):
+        monkeypatch.setattr(settings, "TRACK_REQUESTS", True)
+        monkeypatch.setattr(settings, "REMOTE_TRACKING_URL", "http://example.com")
+        track_many = AsyncMock()
+        monkeypatch.setattr(utils.meta, "track_many", track_many)
+        return track_many
+
+    @pytest.mark.asyncio
+    async def it_sends_queued_requests_in_batches(expect, track_many):
+        sent = asyncio.Event()
+        track_many.side_effect = lambda events: sent.set()
+
+        await utils.meta.start_tracking()
+        utils.meta.track_later("request", ["foo"])
+        utils.meta.track_later("request", ["bar"])
+        await sent.wait()
+        await utils.meta.stop_tracking()
+
+        track_many.assert_awaited_once_with(
+            [("request", ["foo"]), ("request", ["bar"])]
+        )
+
+    @pytest.mark.asyncio
+    async def it_flushes_queued_requests_when_stopped(expect, track_many):
+        await utils.meta.start_tracking()
+        utils.meta.track_later("request", ["foo"])
+        utils.meta.track_later("request", ["bar"])
+        await utils.meta.stop_tracking()
+
+        track_many.assert_awaited_once_with(
+            [("request", ["foo"]), ("request", ["bar"])]
+        )
+
+    @pytest.mark.asyncio
+    async def it_drops_requests_when_the_queue_is_full(expect, monkeypatch, track_many):
+        monkeypatch.setattr(settings, "TRACKING_QUEUE_SIZE", 1)
+
+        await utils.meta.start_tracking()
+        utils.meta.track_later("request", ["foo"])
+        utils.meta.track_later("request", ["bar"])
+        await utils.meta.stop_tracking()
+
+        track_many.assert_awaited_once_with([("request", ["foo"])])
+
+    @pytest.mark.asyncio
+    async def it_keeps_tracking_after_errors(expect, track_many):
+        failed = asyncio.Event()
+        sent = asyncio.Event()
+
+        def send(events):
+            if not failed.is_set():
+                failed.set()
+                raise RuntimeError("Unable to connect")
+            sent.set()
+
+        track_many.side_effect = send
+
+        await utils.meta.start_tracking()
+        utils.meta.track_later("request", ["foo"])
+        await failed.wait()
+        utils.meta.track_later("request", ["bar"])
+        await asyncio.wait_for(sent.wait(), timeout=1)
+        await utils.meta.stop_tracking()
+
+        track_many.assert_awaited_with([("request", ["bar"])])
@@ -38,3 +38,17 @@ def test_encode_quotes(expect):
 
 def test_encode_dashes(expect):
     expect(utils.text.encode(["1–2 in. of snow"])) == "1-2_in._of_snow"
+
+
+@pytest.mark.parametrize(
+    ("slug", "too_long"),
+    [
+        ("a" * 200, False),
+        ("a" * 201, True),
+        ("a" * 200 + "/" + "b" * 200, False),
+        ("é" * 100, False),
+        ("é" * 101, True),
+    ],
+)
+def test_is_too_long(expect, slug, too_long):
+    expect(utils.text.is_too_long(slug)) == too_long
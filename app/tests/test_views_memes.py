@@ -1,9 +1,11 @@
+import asyncio
 import json
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from .. import settings
+from .. import settings, utils
+from ..views import memes
 
 
 def describe_list():
@@ -160,6 +162,20 @@ def describe_detail():
         expect(response.status) == 414
         expect(response.headers["content-type"]) == "image/jpeg"
 
+    def describe_render_pool():
+        @pytest.fixture(autouse=True)
+        def render_pool(monkeypatch):
+            monkeypatch.setattr(settings, "RENDER_PROCESSES", 1)
+            utils.images.start_render_pool()
+            yield
+            asyncio.run(utils.images.stop_render_pool())
+
+        @pytest.mark.slow
+        def it_renders_images_in_a_separate_process(expect, client):
+            request, response = client.get("/images/fry/render_pool.png", timeout=10)
+            expect(response.status) == 200
+            expect(response.headers["content-type"]) == "image/png"
+
     def describe_watermark():
         @pytest.fixture(autouse=True)
         def watermark_settings(monkeypatch, client):
@@ -250,6 +266,14 @@ def describe_detail():
             expect(response.status) == 301
             expect(response.headers["Location"]) == redirect
 
+        def it_keeps_repeated_arguments_when_redirecting(expect, client):
+            request, response = client.get(
+                "/images/ds.png?style=animated&foo=1&foo=2", allow_redirects=False
+            )
+            redirect = "/images/ds.gif?foo=1&foo=2"
+            expect(response.status) == 301
+            expect(response.headers["Location"]) == redirect
+
         @pytest.mark.slow
         def it_rejects_invalid_styles(expect, client, base_url):
             request, response = client.get(base_url + "style=foobar")
@@ -328,6 +352,17 @@ def describe_detail():
             expect(response.headers["content-type"]) == "image/png"
 
 
+def describe_load_template():
+    def it_only_caches_known_templates(expect, monkeypatch, unknown_template):
+        monkeypatch.setattr(settings, "DEPLOYED", True)
+        monkeypatch.setattr(memes, "_TEMPLATES", {})
+
+        memes.load_template("fry")
+        memes.load_template(unknown_template.id)
+
+        expect(list(memes._TEMPLATES)) == ["fry"]
+
+
 def describe_automatic():
     def describe_POST():
         def it_requires_text(expect, client):
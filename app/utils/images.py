@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Iterator
+from uuid import uuid4
 
 from PIL import (
     Image,
@@ -26,6 +30,24 @@ EXCEPTIONS = (
     UnidentifiedImageError,
 )
 
+RENDER_POOL: ProcessPoolExecutor | None = None
+
+
+def start_render_pool():
+    global RENDER_POOL
+    logger.info(f"Starting {settings.RENDER_PROCESSES} render process(es)")
+    RENDER_POOL = ProcessPoolExecutor(
+        max_workers=settings.RENDER_PROCESSES,
+        mp_context=multiprocessing.get_context("forkserver"),
+    )
+
+
+async def stop_render_pool():
+    global RENDER_POOL
+    if RENDER_POOL:
+        await asyncio.to_thread(RENDER_POOL.shutdown, cancel_futures=True)
+        RENDER_POOL = None
+
 
 def preview(
     template: Template,
@@ -60,9 +82,15 @@ def save(
     size: Dimensions = (0, 0),
     directory: Path = settings.IMAGES_DIRECTORY,
 ) -> Path:
-    size = fit_image(*size)
-
-    path = directory / template.build_path(lines, style, size, watermark, extension)
+    path, size = build_path(
+        template,
+        lines,
+        watermark,
+        extension=extension,
+        style=style,
+        size=size,
+        directory=directory,
+    )
     if path.exists():
         if settings.DEPLOYED:
             logger.info(f"Loading meme from {path}")
@@ -72,18 +100,74 @@ def save(
         logger.info(f"Saving meme to {path}")
         path.parent.mkdir(parents=True, exist_ok=True)
 
-    if extension == "gif":
-        frames, duration = render_animation(template, lines, size, watermark=watermark)
-        frames[0].save(
-            path, save_all=True, append_images=frames[1:], duration=duration, loop=0
-        )
-    else:
-        image = render_image(template, style, lines, size, watermark=watermark)
-        image.convert("RGB").save(path, quality=95)
+    temporary = path.with_name(f".{uuid4().hex[:8]}.tmp{path.suffix}")
+    try:
+        if extension == "gif":
+            frames, duration = render_animation(
+                template, lines, size, watermark=watermark
+            )
+            frames[0].save(
+                temporary,
+                save_all=True,
+                append_images=frames[1:],
+                duration=duration,
+                loop=0,
+            )
+        else:
+            image = render_image(template, style, lines, size, watermark=watermark)
+            image.convert("RGB").save(temporary, quality=95)
+        temporary.replace(path)
+    finally:
+        temporary.unlink(missing_ok=True)
 
     return path
 
 
+def find(
+    template: Template,
+    lines: list[str],
+    watermark: str = "",
+    *,
+    extension: str = settings.DEFAULT_EXTENSION,
+    style: str = settings.DEFAULT_STYLE,
+    size: Dimensions = (0, 0),
+    directory: Path = settings.IMAGES_DIRECTORY,
+) -> Path | None:
+    if not settings.DEPLOYED:
+        return None
+
+    path, _size = build_path(
+        template,
+        lines,
+        watermark,
+        extension=extension,
+        style=style,
+        size=size,
+        directory=directory,
+    )
+    return path if path.exists() else None
+
+
+def build_path(
+    template: Template,
+    lines: list[str],
+    watermark: str = "",
+    *,
+    extension: str = settings.DEFAULT_EXTENSION,
+    style: str = settings.DEFAULT_STYLE,
+    size: Dimensions = (0, 0),
+    directory: Path = settings.IMAGES_DIRECTORY,
+) -> tuple[Path, Dimensions]:
+    size = fit_image(*size)
+    path = directory / template.build_path(lines, style, size, watermark, extension)
+    return path, size
+
+
+def save_by_id(id: str, lines: list[str], watermark: str = "", **kwargs) -> Path:
+    template = Template.objects.get(id)
+    return save(template, lines, watermark, **kwargs)
+
+
 def load(path: Path) -> Image:
     image = Image.open(path).convert("RGBA")
     image = ImageOps.exif_transpose(image)
@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 from urllib.parse import unquote
 
@@ -6,6 +7,10 @@ from aiocache import cached
 from sanic.log import logger
 
 from .. import settings
+from . import urls
+
+TRACKING_QUEUE: asyncio.Queue | None = None
+TRACKING_TASK: asyncio.Task | None = None
 
 
 def version() -> str:
@@ -93,41 +98,116 @@ async def get_watermark(request) -> tuple[str, bool]:
     return settings.DEFAULT_WATERMARK, False
 
 
-async def track(request, lines: list[str]):
+async def start_tracking():
+    global TRACKING_QUEUE, TRACKING_TASK
     if settings.TRACK_REQUESTS and settings.REMOTE_TRACKING_URL:
-        api = settings.REMOTE_TRACKING_URL
-    else:
-        return
+        TRACKING_QUEUE = asyncio.Queue(maxsize=settings.TRACKING_QUEUE_SIZE)
+        TRACKING_TASK = asyncio.create_task(_process_tracking(TRACKING_QUEUE))
 
-    text = " ".join(lines).strip()
-    if not text:
-        return
-    if any(name in request.args for name in ["height", "width", "watermark"]):
+
+async def stop_tracking():
+    global TRACKING_QUEUE, TRACKING_TASK
+    queue, task = TRACKING_QUEUE, TRACKING_TASK
+    TRACKING_QUEUE = TRACKING_TASK = None
+    if queue and task and not task.done():
+        await queue.put(None)
+        await task
+
+
+def track_later(request, lines: list[str]):
+    if TRACKING_QUEUE is None:
+        asyncio.create_task(track(request, lines))
         return
-    if "localhost" in getattr(request, "host", "localhost"):
+    try:
+        TRACKING_QUEUE.put_nowait((request, lines))
+    except asyncio.QueueFull:
+        logger.warning("Tracking queue full, dropping request")
+
+
+async def _process_tracking(queue: asyncio.Queue):
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        events = [await queue.get()]
+        deadline = loop.time() + settings.TRACKING_BATCH_DELAY
+        while events[-1] is not None and len(events) < settings.TRACKING_BATCH_SIZE:
+            if queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    events.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            else:
+                events.append(queue.get_nowait())
+
+        if events[-1] is None:
+            stopping = True
+            events.pop()
+        if events:
+            try:
+                await track_many(events)
+            except Exception:
+                logger.exception("Unable to track batch of requests")
+
+
+async def track_many(events: list[tuple]):
+    events = [event for event in events if _should_track(*event)]
+    if not events:
         return
 
     async with aiohttp.ClientSession() as session:
-        params = dict(
-            text=text,
-            client=_get_referer(request) or settings.BASE_URL,
-            result=unquote(request.url),
+        results = await asyncio.gather(
+            *(_track(session, request, lines) for request, lines in events),
+            return_exceptions=True,
         )
-        logger.info(f"Tracking request: {params}")
-        headers = {"X-API-KEY": _get_api_key(request) or ""}
-        response = await session.get(api, params=params, headers=headers)
-        if response.status != 200:
-            try:
-                message = await response.json()
-            except aiohttp.client_exceptions.ContentTypeError:
-                message = await response.text()
-            logger.error(f"Tracker response {response.status}: {message}")
-        if response.status >= 404 and response.status not in {414, 421, 520}:
-            settings.REMOTE_TRACKING_ERRORS += 1
-            logger.info(f"Tracker error count: {settings.REMOTE_TRACKING_ERRORS}")
-            if settings.REMOTE_TRACKING_ERRORS >= settings.REMOTE_TRACKING_ERRORS_LIMIT:
-                settings.TRACK_REQUESTS = False
-                logger.warning(f"Disabled tracking after {response.status} response")
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Unable to track request: {result}")
+
+
+async def track(request, lines: list[str]):
+    if _should_track(request, lines):
+        async with aiohttp.ClientSession() as session:
+            await _track(session, request, lines)
+
+
+def _should_track(request, lines: list[str]) -> bool:
+    if not (settings.TRACK_REQUESTS and settings.REMOTE_TRACKING_URL):
+        return False
+    if not " ".join(lines).strip():
+        return False
+    if any(name in request.args for name in ["height", "width", "watermark"]):
+        return False
+    if "localhost" in getattr(request, "host", "localhost"):
+        return False
+    return True
+
+
+async def _track(session: aiohttp.ClientSession, request, lines: list[str]):
+    api = settings.REMOTE_TRACKING_URL
+    assert api, "Remote tracking is not configured"
+    params = dict(
+        text=" ".join(lines).strip(),
+        client=_get_referer(request) or settings.BASE_URL,
+        result=unquote(request.url),
+    )
+    logger.info(f"Tracking request: {params}")
+    headers = {"X-API-KEY": _get_api_key(request) or ""}
+    response = await session.get(api, params=params, headers=headers)
+    if response.status != 200:
+        try:
+            message = await response.json()
+        except aiohttp.client_exceptions.ContentTypeError:
+            message = await response.text()
+        logger.error(f"Tracker response {response.status}: {message}")
+    if response.status >= 404 and response.status not in {414, 421, 520}:
+        settings.REMOTE_TRACKING_ERRORS += 1
+        logger.info(f"Tracker error count: {settings.REMOTE_TRACKING_ERRORS}")
+        if settings.REMOTE_TRACKING_ERRORS >= settings.REMOTE_TRACKING_ERRORS_LIMIT:
+            settings.TRACK_REQUESTS = False
+            logger.warning(f"Disabled tracking after {response.status} response")
 
 
 async def search(request, text: str, safe: bool, *, mode="") -> list[dict]:
@@ -155,6 +235,21 @@ async def search(request, text: str, safe: bool, *, mode="") -> list[dict]:
         return []
 
 
+async def search_and_tokenize(
+    request, text: str, safe: bool, *, mode="", limit=0
+) -> list[dict]:
+    results = await search(request, text, safe, mode=mode)
+    logger.info(f"Found {len(results)} result(s)")
+    if limit:
+        results = results[:limit]
+
+    normalized = [urls.normalize(result["image_url"]) for result in results]
+    tokenized = await asyncio.gather(*(tokenize(request, url) for url in normalized))
+    return [
+        {**result, "url": url} for result, (url, _updated) in zip(results, tokenized)
+    ]
+
+
 def _get_referer(request):
     referer = request.headers.get("referer") or request.args.get("referer")
     if referer and referer.startswith(settings.BASE_URL) and "/docs/" not in referer:
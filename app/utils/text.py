@@ -78,6 +78,13 @@ def normalize(slug: str) -> tuple[str, bool]:
     return normalized_slug, slug != normalized_slug
 
 
+def is_too_long(slug: str, limit: int = 200) -> bool:
+    parts = slug.split("/")
+    if slug.isascii():
+        return any(len(part) > limit for part in parts)
+    return any(len(part.encode()) > limit for part in parts)
+
+
 def fingerprint(value: str, *, prefix="_custom-", suffix="") -> str:
     return prefix + hashlib.sha1(value.encode()).hexdigest() + suffix
 
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from urllib.parse import unquote, urlencode
 
 from furl import furl
@@ -27,10 +28,19 @@ def arg(data: dict, default, *names: str):
 
 
 def flag(request, name, default=None):
-    value = request.args.get(name, "").lower()
+    value = lower(request.args.get(name, ""))
     return FLAGS.get(value, default)
 
 
+def query(request, name: str = "filter") -> str:
+    return lower(request.args.get(name, ""))
+
+
+@lru_cache(maxsize=1024)
+def lower(value: str) -> str:
+    return value.lower()
+
+
 def add(url: str, **kwargs):
     joiner = "&" if "?" in url else "?"
     return url + joiner + urlencode(kwargs)
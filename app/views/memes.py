@@ -1,10 +1,15 @@
 import asyncio
+import os
+from functools import lru_cache, partial, wraps
+from mimetypes import guess_type
+from pathlib import Path
 
 from sanic import Blueprint, response
 from sanic.log import logger
 from sanic_openapi import doc
 
 from .. import helpers, models, settings, utils
+from ..types import Dimensions
 from .templates import generate_url
 
 blueprint = Blueprint("Memes", url_prefix="/images")
@@ -25,11 +30,9 @@ blueprint = Blueprint("Memes", url_prefix="/images")
     content_type="application/json",
 )
 async def index(request):
-    query = request.args.get("filter", "").lower()
-    examples = await asyncio.to_thread(helpers.get_example_images, request, query)
-    return response.json(
-        [{"url": url, "template": template} for url, template in examples]
-    )
+    query = utils.urls.query(request)
+    body = await asyncio.to_thread(helpers.get_example_images_json, request, query)
+    return response.raw(body, content_type="application/json")
 
 
 @blueprint.post("/")
@@ -70,25 +73,21 @@ async def create(request):
     400, {"error": str}, description='Required "text" missing in request body'
 )
 async def automatic(request):
-    if request.form:
-        payload = dict(request.form)
-    else:
-        payload = request.json or {}
+    payload = request.form or request.json or {}
 
-    try:
-        query = payload["text"]
-    except KeyError:
+    query = payload.get("text")
+    if query is None:
         return response.json({"error": '"text" is required'}, status=400)
 
-    results = await utils.meta.search(request, query, payload.get("safe", True))
-    logger.info(f"Found {len(results)} result(s)")
+    results = await utils.meta.search_and_tokenize(
+        request, query, payload.get("safe", True), limit=1
+    )
     if not results:
         return response.json({"message": f"No results matched: {query}"}, status=404)
 
-    url = utils.urls.normalize(results[0]["image_url"])
+    url = results[0]["url"]
     confidence = results[0]["confidence"]
     logger.info(f"Top result: {url} ({confidence})")
-    url, _updated = await utils.meta.tokenize(request, url)
 
     if payload.get("redirect", False):
         return response.redirect(utils.urls.add(url, status="201"))
@@ -136,19 +135,14 @@ async def custom(request):
     content_type="application/json",
 )
 async def list_custom(request):
-    query = request.args.get("filter", "").lower()
+    query = utils.urls.query(request)
     safe = utils.urls.flag(request, "safe", True)
 
-    results = await utils.meta.search(request, query, safe, mode="results")
-    logger.info(f"Found {len(results)} result(s)")
+    results = await utils.meta.search_and_tokenize(request, query, safe, mode="results")
     if not results:
         return response.json({"message": f"No results matched: {query}"}, status=404)
 
-    items = []
-    for result in results:
-        url = utils.urls.normalize(result["image_url"])
-        url, _updated = await utils.meta.tokenize(request, url)
-        items.append({"url": url})
+    items = [{"url": result["url"]} for result in results]
 
     return response.json(items, status=200)
 
@@ -173,14 +167,13 @@ async def blank(request, template_id):
     template_id, extension = template_id.rsplit(".", 1)
 
     if request.args.get("style") == "animated" and extension != "gif":
-        # TODO: Move this pattern to utils
-        params = {k: v for k, v in request.args.items() if k != "style"}
-        url = request.app.url_for(
+        return _redirect(
+            request,
             "Memes.blank",
+            301,
+            exclude="style",
             template_id=template_id + ".gif",
-            **params,
         )
-        return response.redirect(utils.urls.clean(url), status=301)
 
     return await render_image(request, template_id, extension=extension)
 
@@ -206,45 +199,110 @@ async def text(request, template_id, text_paths):
     text_paths, extension = text_paths.rsplit(".", 1)
 
     if request.args.get("style") == "animated" and extension != "gif":
-        # TODO: Move this pattern to utils
-        params = {k: v for k, v in request.args.items() if k != "style"}
-        url = request.app.url_for(
+        return _redirect(
+            request,
             "Memes.text",
+            301,
+            exclude="style",
             template_id=template_id,
             text_paths=text_paths + ".gif",
-            **params,
         )
-        return response.redirect(utils.urls.clean(url), status=301)
 
-    slug, updated = utils.text.normalize(text_paths)
+    slug, updated = _normalize(text_paths)
     if updated:
-        url = request.app.url_for(
+        return _redirect(
+            request,
             "Memes.text",
+            301,
             template_id=template_id,
             text_paths=slug + "." + extension,
-            **request.args,
         )
-        return response.redirect(utils.urls.clean(url), status=301)
 
-    url, updated = await utils.meta.tokenize(request, request.url)
-    if updated:
-        return response.redirect(url, status=302)
+    if request.args.get("token"):
+        url, updated = await utils.meta.tokenize(request, request.url)
+        if updated:
+            return response.redirect(url, status=302)
+        watermark, updated = await utils.meta.get_watermark(request)
+    else:
+        get_watermark = asyncio.create_task(utils.meta.get_watermark(request))
+        try:
+            url, updated = await utils.meta.tokenize(request, request.url)
+            if updated:
+                return response.redirect(url, status=302)
+            watermark, updated = await get_watermark
+        finally:
+            get_watermark.cancel()
+            if get_watermark.done() and not get_watermark.cancelled():
+                get_watermark.exception()
 
-    watermark, updated = await utils.meta.get_watermark(request)
     if updated:
-        # TODO: Move this pattern to utils
-        params = {k: v for k, v in request.args.items() if k != "watermark"}
-        url = request.app.url_for(
+        return _redirect(
+            request,
             "Memes.text",
+            302,
+            exclude="watermark",
             template_id=template_id,
             text_paths=slug + "." + extension,
-            **params,
         )
-        return response.redirect(utils.urls.clean(url), status=302)
 
     return await render_image(request, template_id, slug, watermark, extension)
 
 
+_TEMPLATES: dict[str, tuple[models.Template, bool]] = {}
+
+
+def load_template(id: str) -> tuple[models.Template | None, bool]:
+    if id in _TEMPLATES:
+        return _TEMPLATES[id]
+
+    template = models.Template.objects.get_or_none(id)
+    if not template:
+        return None, False
+
+    exists = template.image.exists()
+    if settings.DEPLOYED:
+        if len(_TEMPLATES) >= settings.TEMPLATE_CACHE_SIZE:
+            _TEMPLATES.pop(next(iter(_TEMPLATES)))
+        _TEMPLATES[id] = template, exists
+    return template, exists
+
+
+def _cache_slugs(function):
+    cached = lru_cache(maxsize=8192)(function)
+
+    @wraps(function)
+    def wrapper(slug: str):
+        if utils.text.is_too_long(slug):
+            return function(slug)
+        return cached(slug)
+
+    return wrapper
+
+
+@_cache_slugs
+def _decode(slug: str) -> tuple[str, ...]:
+    return tuple(utils.text.decode(slug))
+
+
+_normalize = _cache_slugs(utils.text.normalize)
+
+
+@lru_cache(maxsize=1024)
+def _parse_size(width: str | int, height: str | int) -> Dimensions:
+    size = int(width), int(height)
+    if 0 < size[0] < 10 or 0 < size[1] < 10:
+        raise ValueError(f"dimensions are too small: {size}")
+    return size
+
+
+def _redirect(request, name: str, status: int, *, exclude: str = "", **kwargs):
+    params = request.args.copy()
+    params.pop(exclude, None)
+    params.update(kwargs)
+    url = request.app.url_for(name, **params)
+    return response.redirect(utils.urls.clean(url), status=status)
+
+
 async def render_image(
     request,
     id: str,
@@ -252,15 +310,15 @@ async def render_image(
     watermark: str = "",
     extension: str = settings.DEFAULT_EXTENSION,
 ):
-    lines = utils.text.decode(slug)
-    asyncio.create_task(utils.meta.track(request, lines))
+    lines = list(_decode(slug))
+    utils.meta.track_later(request, lines)
 
     status = int(utils.urls.arg(request.args, "200", "status"))
 
-    if any(len(part.encode()) > 200 for part in slug.split("/")):
+    if utils.text.is_too_long(slug):
         logger.error(f"Slug too long: {slug}")
         slug = slug[:50] + "..."
-        lines = utils.text.decode(slug)
+        lines = list(_decode(slug))
         template = models.Template.objects.get("_error")
         style = settings.DEFAULT_STYLE
         status = 414
@@ -277,7 +335,7 @@ async def render_image(
 
             style = utils.urls.arg(request.args, settings.DEFAULT_STYLE, "style")
             if not utils.urls.schema(style):
-                style = style.lower()
+                style = utils.urls.lower(style)
             if not await template.check(style):
                 if utils.urls.schema(style):
                     status = 415
@@ -291,8 +349,8 @@ async def render_image(
             status = 422
 
     else:
-        template = models.Template.objects.get_or_none(id)
-        if not template or not template.image.exists():
+        template, exists = load_template(id)
+        if not template or not exists:
             logger.error(f"No such template: {id}")
             template = models.Template.objects.get("_error")
             if id != settings.PLACEHOLDER:
@@ -306,9 +364,7 @@ async def render_image(
                 status = 422
 
     try:
-        size = int(request.args.get("width", 0)), int(request.args.get("height", 0))
-        if 0 < size[0] < 10 or 0 < size[1] < 10:
-            raise ValueError(f"dimensions are too small: {size}")
+        size = _parse_size(request.args.get("width", 0), request.args.get("height", 0))
     except ValueError as e:
         logger.error(f"Invalid size: {e}")
         size = 0, 0
@@ -318,13 +374,48 @@ async def render_image(
         extension = settings.DEFAULT_EXTENSION
         status = 422
 
-    path = await asyncio.to_thread(
-        utils.images.save,
-        template,
-        lines,
-        watermark,
-        extension=extension,
-        style=style,
-        size=size,
+    path, content = await save_image(
+        template, lines, watermark, extension=extension, style=style, size=size
     )
-    return await response.file(path, status)
+    return await send_image(path, status, content)
+
+
+async def send_image(path: Path, status: int, content: bytes | None = None):
+    content_type = guess_type(path.name)[0] or "text/plain"
+    if content is None:
+        content = read_image(path)
+    if content is None:
+        return await response.file_stream(path, status, mime_type=content_type)
+    return response.raw(content, status, content_type=content_type)
+
+
+def read_image(path: Path) -> bytes | None:
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size <= settings.MAXIMUM_INLINE_BYTES:
+            return f.read()
+    return None
+
+
+async def save_image(
+    template: models.Template, lines: list[str], watermark: str, **kwargs
+) -> tuple[Path, bytes | None]:
+    existing = utils.images.find(template, lines, watermark, **kwargs)
+    if existing:
+        logger.info(f"Loading meme from {existing}")
+        return existing, None
+
+    if utils.images.RENDER_POOL:
+        loop = asyncio.get_running_loop()
+        path = await loop.run_in_executor(
+            utils.images.RENDER_POOL,
+            partial(utils.images.save_by_id, template.id, lines, watermark, **kwargs),
+        )
+        return path, None
+    return await asyncio.to_thread(
+        _save_and_read_image, template, lines, watermark, **kwargs
+    )
+
+
+def _save_and_read_image(*args, **kwargs) -> tuple[Path, bytes | None]:
+    path = utils.images.save(*args, **kwargs)
+    return path, read_image(path)
@@ -44,7 +44,7 @@ TemplateResponse = {
     content_type="application/json",
 )
 async def index(request):
-    query = request.args.get("filter", "").lower()
+    query = utils.urls.query(request)
     animated = utils.urls.flag(request, "animated")
     data = await asyncio.to_thread(
         helpers.get_valid_templates, request, query, animated